@@ -0,0 +1,468 @@
+import argparse
+import contextlib
+import fnmatch
+import gc
+import io
+import json
+import math
+import os
+import random
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+
+from engine import WordleEngine
+from solver import WordleSolver
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_WORD_FILES = ["words.txt", "words_max.txt"]
+
+
+# --- FIXTURES ---
+class _QuietEngine(WordleEngine):
+    """ Silences only the secret-word DEBUG print; _load_words errors still show. """
+    def start_game(self):
+        with contextlib.redirect_stdout(io.StringIO()):
+            super().start_game()
+
+
+def _quiet_engine(word_file, seed):
+    """ Builds a seeded engine without the DEBUG print from start_game(). """
+    random.seed(seed)
+    return _QuietEngine(word_file)
+
+
+def _constrained_solver(engine, strategy, seed, n_guesses=1):
+    """
+    Returns a solver whose constraints come from real feedback:
+    a few seeded guesses are played against the engine's secret word.
+    """
+    rng = random.Random(seed)
+    solver = WordleSolver(engine, strategy)
+    for guess in rng.sample(engine.word_list, n_guesses):
+        engine.guesses = []
+        feedback = engine.process_guess(guess)
+        solver._update_constraints(guess, feedback)
+    return solver
+
+
+# --- BENCHMARK CASES ---
+# Each case takes (word_file, seed) and returns a zero-argument callable: one "op".
+
+def bench_process_guess(word_file, seed):
+    engine = _quiet_engine(word_file, seed)
+    guesses = random.Random(seed).sample(engine.word_list, min(256, len(engine.word_list)))
+    untested = dict(engine.letter_states)
+    state = {"i": 0}
+
+    def op():
+        # start_game() minus random.choice: every op scores a guess on a fresh board
+        engine.guesses = []
+        engine.game_over = False
+        engine.is_win = False
+        engine.letter_states = untested.copy()
+        engine.process_guess(guesses[state["i"] % len(guesses)])
+        state["i"] += 1
+    return op
+
+
+def bench_constraint_filter(word_file, seed):
+    engine = _quiet_engine(word_file, seed)
+    solver = _constrained_solver(engine, "A*", seed)
+    dictionary = solver.full_dictionary
+    inf = float('inf')
+
+    def op():
+        # One pass of the UCS/A* filter over the whole dictionary
+        return [w for w in dictionary if solver._get_constraint_cost(w) < inf]
+    return op
+
+
+def bench_static_costs(word_file, seed):
+    engine = _quiet_engine(word_file, seed)
+    solver = WordleSolver(engine, "A*")
+    return solver._build_static_costs
+
+
+def bench_astar_select(word_file, seed):
+    engine = _quiet_engine(word_file, seed)
+    solver = _constrained_solver(engine, "A*", seed)
+    return solver._search_entire_space
+
+
+def bench_load_words(word_file, seed):
+    engine = _quiet_engine(word_file, seed)
+    return lambda: engine._load_words(word_file)
+
+
+BENCHMARKS = {
+    "engine.process_guess": bench_process_guess,
+    "solver.constraint_filter": bench_constraint_filter,
+    "solver.build_static_costs": bench_static_costs,
+    "solver.astar_select": bench_astar_select,
+    "engine.load_words": bench_load_words,
+}
+
+
+
+
+# --- MEASUREMENT ---
+def _calibrate(op, min_time):
+    """ Doubles the loop count until one repeat takes at least min_time seconds. """
+    loops = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(loops):
+            op()
+        if time.perf_counter() - start >= min_time or loops >= 1 << 20:
+            return loops
+        loops *= 2
+
+
+# Allocations made by tracemalloc itself or by this harness are not the op's
+_HARNESS_FILTERS = [
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, __file__),
+]
+
+# Compile the filter patterns now, not lazily mid-measurement where they'd count as retained
+for _f in _HARNESS_FILTERS:
+    fnmatch.fnmatch(__file__, _f.filename_pattern)
+
+
+def _traced_blocks():
+    gc.collect()
+    snapshot = tracemalloc.take_snapshot().filter_traces(_HARNESS_FILTERS)
+    return sum(stat.count for stat in snapshot.statistics("filename"))
+
+
+def _warm_until_stable(op, settle=5, max_calls=1000):
+    """
+    Calls op() until the interpreter's allocated block count stays the same for
+    `settle` calls in a row. I/O and interpreter caches keep growing for the first
+    few dozen calls before leveling off; counting them would make a leak-free op
+    look like it retains blocks. A real leak never settles and just runs to max_calls.
+    Runs untraced: snapshots taken between calls get their own containers resized
+    inside op() and show up as blocks retained by it.
+    """
+    gc.collect()
+    count, unchanged = sys.getallocatedblocks(), 0
+    for _ in range(max_calls):
+        op()
+        gc.collect()
+        new_count = sys.getallocatedblocks()
+        unchanged = unchanged + 1 if new_count == count else 0
+        count = new_count
+        if unchanged >= settle:
+            return
+
+
+def _measure_memory(op, samples, max_rounds=10):
+    """
+    Returns (peak KB per op, net retained blocks per op) using tracemalloc.
+    Neither is an allocation count: the first is the size high-water mark of one op,
+    the second is how many blocks are still held after it returns.
+    Retained blocks are the slope between a batch of `samples` ops and one of twice
+    that: each snapshot costs a block or two of cache churn on its own, and the slope
+    cancels it. Rounds repeat until the slope is 0 or the same three times in a row,
+    since cache warm-up can skew the first rounds.
+    Run separately from the timing loop because tracing slows every allocation.
+    """
+    peaks = [0] * (2 * samples)
+    _warm_until_stable(op)
+    tracemalloc.start()
+    try:
+        _traced_blocks()  # The first snapshot fills abc caches; keep it out of the count
+        blocks = _traced_blocks()
+        slopes = [None] * max_rounds
+        for round_ in range(max_rounds):
+            retained = [0, 0]
+            for batch, size in enumerate((samples, 2 * samples)):
+                for i in range(size):
+                    base, _peak = tracemalloc.get_traced_memory()
+                    tracemalloc.reset_peak()
+                    op()
+                    _current, peak = tracemalloc.get_traced_memory()
+                    peaks[i] = peak - base
+                new_blocks = _traced_blocks()
+                retained[batch] = new_blocks - blocks
+                blocks = new_blocks
+            slope = slopes[round_] = (retained[1] - retained[0]) / samples
+            recent = slopes[max(0, round_ - 2):round_ + 1]
+            if slope == 0 or (len(recent) == 3 and len(set(recent)) == 1):
+                break
+    finally:
+        tracemalloc.stop()
+    return statistics.median(peaks) / 1024, max(slope, 0.0)
+
+
+def _resolve_path(word_file):
+    return word_file if os.path.isabs(word_file) else os.path.join(BASE_DIR, word_file)
+
+
+def run_case(name, word_file, seed=0, warmup=1, repeat=3, min_time=0.1, mem_samples=20):
+    """
+    Times one benchmark case on one word list in this process. Returns a result dict.
+    Set mem_samples to 0 to skip the tracemalloc pass.
+    """
+    path = _resolve_path(word_file)
+    if not os.path.isfile(path):
+        # WordleEngine would silently fall back to a 5-word list
+        raise FileNotFoundError(f"Word list not found: {path}")
+    op = BENCHMARKS[name](path, seed)
+
+    for _ in range(warmup):
+        op()
+    loops = _calibrate(op, min_time)
+
+    timings = []
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            random.seed(seed)
+            start = time.perf_counter()
+            for _ in range(loops):
+                op()
+            timings.append((time.perf_counter() - start) / loops)
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+
+    peak_kb, blocks = None, None
+    if mem_samples:
+        random.seed(seed)
+        peak_kb, blocks = _measure_memory(op, mem_samples)
+
+    return {
+        "name": name,
+        "words": os.path.basename(word_file),
+        "loops": loops,
+        "repeat": repeat,
+        "median_s": statistics.median(timings),
+        "stdev_s": statistics.stdev(timings) if len(timings) > 1 else 0.0,
+        "peak_kb_per_op": peak_kb,
+        "retained_blocks_per_op": blocks,
+    }
+
+
+def _run_worker(name, word_file, hash_seed, seed, warmup, repeat, min_time, mem_samples):
+    """ Runs run_case() in a fresh interpreter with a pinned hash seed. """
+    cmd = [sys.executable, os.path.abspath(__file__), "--worker", name, word_file,
+           "--seed", str(seed), "--warmup", str(warmup), "--repeat", str(repeat),
+           "--min-time", str(min_time), "--mem-samples", str(mem_samples)]
+    env = dict(os.environ, PYTHONHASHSEED=str(hash_seed))
+    out = subprocess.run(cmd, env=env, stdout=subprocess.PIPE, text=True, check=True).stdout
+    return json.loads(out.splitlines()[-1])
+
+
+def _aggregate(runs):
+    """ Folds the per-process results of one case into a single result dict. """
+    medians = [r["median_s"] for r in runs]
+    median = statistics.median(medians)
+    return {
+        "name": runs[0]["name"],
+        "words": runs[0]["words"],
+        "processes": len(runs),
+        "loops": runs[0]["loops"],
+        "repeat": runs[0]["repeat"],
+        "median_s": median,
+        # Between-process stdev of the per-process medians
+        "stdev_s": statistics.stdev(medians) if len(medians) > 1 else 0.0,
+        # None rather than inf: a zero median means the timer could not resolve the op
+        "ops_per_sec": 1.0 / median if median > 0 else None,
+        "process_ops_per_sec": [1.0 / m if m > 0 else None for m in medians],
+        "peak_kb_per_op": runs[0]["peak_kb_per_op"],
+        "retained_blocks_per_op": runs[0]["retained_blocks_per_op"],
+    }
+
+
+def run_suite(names=None, word_files=None, hash_seed=0, processes=5, mem_samples=20, **kwargs):
+    """
+    Runs every case in `processes` fresh interpreters and aggregates them.
+    The spread between processes is what decides whether a change is real: one
+    process's repeats all share its memory layout and CPU state. Processes go
+    round-robin over the cases, so each case's spread also covers machine drift
+    over the whole run rather than a few seconds of it.
+    """
+    names = names or list(BENCHMARKS)
+    word_files = word_files or DEFAULT_WORD_FILES
+    cases = [(name, word_file) for word_file in word_files for name in names]
+    runs = {case: [] for case in cases}
+    for round_ in range(processes):
+        print(f"Round {round_ + 1}/{processes}...", flush=True)
+        for name, word_file in cases:
+            runs[(name, word_file)].append(_run_worker(
+                name, word_file, hash_seed, mem_samples=mem_samples if round_ == 0 else 0, **kwargs))
+
+    results = [_aggregate(runs[case]) for case in cases]
+    print(HEADER)
+    print("-" * len(HEADER))
+    for result in results:
+        print(_format_row(result))
+    return results
+
+
+# --- REPORTING ---
+HEADER = (f"{'Benchmark':<28}{'Words':<16}{'ops/sec':>14}{'median':>12}{'spread':>8}"
+          f"{'peak KB/op':>12}{'net retained blocks/op':>24}")
+
+# Changes below this fraction are never reported as faster/slower, whatever the spread says
+MIN_CHANGE = 0.05
+RUN_INFO_KEYS = ("python", "seed", "hash_seed")
+
+
+def _format_time(seconds):
+    for unit, scale in (("s", 1), ("ms", 1e-3), ("us", 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:.2f}{unit}"
+    return f"{seconds / 1e-9:.0f}ns"
+
+
+def _format_ops(ops):
+    return f"{ops:,.1f}" if ops else "n/a"
+
+
+def _spread(r):
+    """ Between-process stdev as a fraction of the median. """
+    return r["stdev_s"] / r["median_s"] if r["median_s"] else 0.0
+
+
+def _format_row(r):
+    return (f"{r['name']:<28}{r['words']:<16}{_format_ops(r['ops_per_sec']):>14}"
+            f"{_format_time(r['median_s']):>12}{_spread(r) * 100:>7.1f}%"
+            f"{r['peak_kb_per_op']:>12.1f}{r['retained_blocks_per_op']:>24.1f}")
+
+
+def _verdict(old, new, speedup):
+    """
+    "faster"/"slower" only when the change clears MIN_CHANGE and twice the combined
+    spread, and no baseline process overlaps any candidate process.
+    """
+    threshold = max(MIN_CHANGE, 2 * math.hypot(_spread(old), _spread(new)))
+    old_ops = [o for o in old.get("process_ops_per_sec", [old["ops_per_sec"]]) if o]
+    new_ops = [o for o in new.get("process_ops_per_sec", [new["ops_per_sec"]]) if o]
+    overlap = min(new_ops) <= max(old_ops) and min(old_ops) <= max(new_ops)
+    if abs(speedup - 1) <= threshold or overlap:
+        return "noise"
+    return "faster" if speedup > 1 else "slower"
+
+
+def compare(baseline, candidate, force=False):
+    """
+    Prints the ops/sec change for every (benchmark, word list) present in both runs,
+    alongside each run's between-process spread.
+    Raises ValueError if the runs differ in Python version, seed or hash seed, unless force is set.
+    Returns a list of (name, words, speedup) tuples; speedup > 1 means faster.
+    """
+    mismatches = [f"{key}: {baseline.get(key)} vs {candidate.get(key)}"
+                  for key in RUN_INFO_KEYS if baseline.get(key) != candidate.get(key)]
+    if mismatches and not force:
+        raise ValueError("runs are not comparable (" + "; ".join(mismatches) + ")")
+    for mismatch in mismatches:
+        print(f"WARNING: runs differ in {mismatch}; timings are not comparable")
+
+    base_index = {(r["name"], r["words"]): r for r in baseline["results"]}
+    cand_index = {(r["name"], r["words"]): r for r in candidate["results"]}
+    rows = []
+    print(f"{'Benchmark':<28}{'Words':<16}{'base ops/s':>14}{'spread':>8}{'new ops/s':>14}{'spread':>8}"
+          f"{'change':>10}  {'verdict':<10}{'peak KB':>16}")
+    for key, r in cand_index.items():
+        old = base_index.get(key)
+        if old is None:
+            continue
+        line = (f"{r['name']:<28}{r['words']:<16}{_format_ops(old['ops_per_sec']):>14}{_spread(old) * 100:>7.1f}%"
+                f"{_format_ops(r['ops_per_sec']):>14}{_spread(r) * 100:>7.1f}%")
+        peak = f"{old['peak_kb_per_op']:>8.1f}->{r['peak_kb_per_op']:<6.1f}"
+        if not old["ops_per_sec"] or not r["ops_per_sec"]:
+            print(f"{line}{'n/a':>10}  {'untimed':<10}{peak}")
+            continue
+
+        speedup = r["ops_per_sec"] / old["ops_per_sec"]
+        rows.append((r["name"], r["words"], speedup))
+        print(f"{line}{(speedup - 1) * 100:>+9.1f}%  {_verdict(old, r, speedup):<10}{peak}")
+
+    only_base = [k for k in base_index if k not in cand_index]
+    only_cand = [k for k in cand_index if k not in base_index]
+    for label, keys in (("baseline", only_base), ("candidate", only_cand)):
+        if keys:
+            print(f"\nOnly in {label}: " + ", ".join(f"{name} ({words})" for name, words in keys))
+    return rows
+
+
+def _load_run(path):
+    with open(path, 'r') as f:
+        return json.load(f)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Microbenchmarks for the engine/solver hot paths.")
+    parser.add_argument("--bench", nargs="+", choices=list(BENCHMARKS), help="Cases to run (default: all)")
+    parser.add_argument("--words", nargs="+", default=DEFAULT_WORD_FILES, help="Word lists to run against")
+    parser.add_argument("--seed", type=int, default=0,
+                        help="Workload seed; also the hash seed unless PYTHONHASHSEED is set")
+    parser.add_argument("--warmup", type=int, default=1)
+    parser.add_argument("--repeat", type=int, default=3, help="Timed repeats per process")
+    parser.add_argument("--processes", type=int, default=5, help="Fresh interpreters per case")
+    parser.add_argument("--min-time", type=float, default=0.1, help="Minimum seconds per repeat")
+    parser.add_argument("--save", metavar="FILE", help="Write results as JSON")
+    parser.add_argument("--compare", nargs="+", metavar="FILE",
+                        help="BASELINE [CANDIDATE]: compare against a saved run (runs the suite if no CANDIDATE)")
+    parser.add_argument("--force", action="store_true",
+                        help="Compare runs even if their Python version, seed or hash seed differ")
+    # Internal: one run_case() per subprocess, result printed as JSON
+    parser.add_argument("--worker", nargs=2, metavar=("NAME", "WORDS"), help=argparse.SUPPRESS)
+    parser.add_argument("--mem-samples", type=int, default=20, help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.worker:
+        result = run_case(*args.worker, seed=args.seed, warmup=args.warmup, repeat=args.repeat,
+                          min_time=args.min_time, mem_samples=args.mem_samples)
+        print(json.dumps(result))
+        return
+
+    if args.compare and len(args.compare) > 2:
+        parser.error("--compare takes BASELINE and an optional CANDIDATE")
+
+    if args.compare and len(args.compare) == 2:
+        if args.save or args.bench:
+            parser.error("--save and --bench cannot be used when comparing two saved runs")
+        try:
+            compare(_load_run(args.compare[0]), _load_run(args.compare[1]), force=args.force)
+        except ValueError as e:
+            parser.error(f"{e}; pass --force to compare anyway")
+        return
+
+    for word_file in args.words:
+        if not os.path.isfile(_resolve_path(word_file)):
+            parser.error(f"word list not found: {word_file}")
+
+    # str hashes decide set iteration order in the solver, which changes the work done per op
+    env_hash_seed = os.environ.get("PYTHONHASHSEED")
+    if env_hash_seed is not None and not env_hash_seed.isdigit():
+        parser.error(f"PYTHONHASHSEED={env_hash_seed} is not reproducible; unset it or use an integer")
+    hash_seed = int(env_hash_seed) if env_hash_seed is not None else args.seed
+
+    baseline = _load_run(args.compare[0]) if args.compare else None
+
+    results = run_suite(args.bench, args.words, hash_seed=hash_seed, processes=args.processes,
+                        seed=args.seed, warmup=args.warmup, repeat=args.repeat, min_time=args.min_time)
+    run = {"python": sys.version.split()[0], "seed": args.seed, "hash_seed": hash_seed, "results": results}
+
+    if args.save:
+        with open(args.save, 'w') as f:
+            json.dump(run, f, indent=2)
+        print(f"\nSaved to {args.save}")
+
+    if baseline is not None:
+        print()
+        try:
+            compare(baseline, run, force=args.force)
+        except ValueError as e:
+            parser.error(f"{e}; pass --force to compare anyway")
+
+
+if __name__ == "__main__":
+    main()